@@ -2,35 +2,114 @@
 This module defines the Agent class responsible for navigating through mazes.
 
 The Agent class utilizes different search algorithms to find a path from a given initial state to a goal state within
-the maze. It supports Depth-First Search (DFS), Breadth-First Search (BFS), and A* Search algorithms.
+the maze. It supports Depth-First Search (DFS), Breadth-First Search (BFS), and A* Search algorithms, as well as the
+memory-bounded IDA* and SMA* variants of A* for very large mazes, the anytime ARA* for callers with a time budget and a
+dead-end filling solver for perfect mazes.
 Callback functions are used within search algorithms for real-time GUI updates, which can be useful for UI.
+Every search fills in the agent's SearchStats, and can optionally be profiled with cProfile and tracemalloc.
 
 Methods:
     - dfs(current_state, goal_state): Performs Depth-First Search (DFS) from the current state to the goal state.
     - bfs(current_state, goal_state): Performs Breadth-First Search (BFS) from the current state to the goal state.
     - a_star(current_state, goal_state): Performs A* (A Start)from the current state to the goal state.
+    - ida_star(initial_state, goal_state): Performs Iterative Deepening A* using memory linear in the path depth.
+    - sma_star(initial_state, goal_state, memory_limit): Performs Simplified Memory-Bounded A* with a node budget.
+    - ara_star(initial_state, goal_state, epsilon, time_limit): Performs anytime ARA* within an optional time limit.
+    - dead_end_filling(initial_state, goal_state): Solves the maze by pruning dead ends until only the path remains.
+    - record_trace(algorithm, initial_state, goal_state): Runs a search headlessly and records it as a SearchTrace.
 
 Author: Peyman Kh
 Date: 08/Feb/2024
 """
 # Import libraries
+import cProfile
+import functools
+import itertools
+import math
+import time
+import tracemalloc
+from array import array
 from dataStructure import Queue, MinHeap
+from searchStats import SearchStats
+from searchTrace import SearchTrace
+
+
+def _instrumented(search):
+    """
+    Wraps a public search of the Agent so that it resets and times the agent's stats, and runs the opt-in profilers
+    around it. Only the outermost call is instrumented, so a search that calls another is measured as one search.
+
+    Parameters:
+        - search (function): The search method to wrap.
+
+    Returns:
+        - function: The wrapped search method.
+    """
+    @functools.wraps(search)
+    def wrapper(self, *args, **kwargs):
+        if self._searching:
+            return search(self, *args, **kwargs)
+
+        self.stats.reset(search.__name__)
+        self._searching = True
+
+        # Start tracing memory before the timer so the snapshot is not counted as search time.
+        started_tracing = False
+        if self.profile_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            snapshot_before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile() if self.profile_cpu else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            return search(self, *args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.stats.phase_times['total'] = time.perf_counter() - start
+            self._searching = False
+
+            # Snapshot memory before summarising the profile, so its allocations are not attributed to the search.
+            if self.profile_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self.stats.record_memory(snapshot_before, tracemalloc.take_snapshot(), peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                self.stats.record_profile(profiler)
+
+    return wrapper
 
 
 class Agent:
     """Represents an agent navigating through a maze."""
-    def __init__(self, maze):
+    def __init__(self, maze, profile_cpu=False, profile_memory=False):
         """
         Initializes the Agent with a maze to solve.
 
         Parameters:
             - maze (Maze): The maze instance that the agent will navigate.
+            - profile_cpu (bool, optional): Run cProfile around each search. Defaults to False.
+            - profile_memory (bool, optional): Take tracemalloc snapshots around each search. Defaults to False.
+
+        Attributes:
+            - stats (SearchStats): Instrumentation of the last search, filled in by every search.
 
         Returns:
             - None
         """
         self.maze = maze
+        self.profile_cpu = profile_cpu
+        self.profile_memory = profile_memory
+        self.stats = SearchStats()
+        self._searching = False
 
+    @_instrumented
     def dfs(self, current_state, goal_state, callback, visited=None):
         """
         Performs Depth-First Search (DFS) from the current state to the goal state.
@@ -50,6 +129,30 @@ class Agent:
         if visited is None:
             visited = set()
 
+        # Count in a list shared by the recursion and store them once the search ends, to keep it cheap.
+        counts = [0, 0, 0]  # Nodes expanded, nodes generated and peak recursion depth.
+        try:
+            return self._dfs(current_state, goal_state, callback, visited, counts, 1)
+        finally:
+            # Every generated state is one recursive call, pushed onto and popped off the call stack.
+            self._record_counts(counts[0], counts[1], counts[1], counts[1], counts[2])
+
+    def _dfs(self, current_state, goal_state, callback, visited, counts, depth):
+        """
+        Recursive step of DFS, kept separate from dfs() so that only the outermost call is instrumented.
+
+        Parameters:
+            - current_state (tuple): The current state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - callback (function): A function to call for updating the GUI.
+            - visited (set): A set of already visited states.
+            - counts (list): Nodes expanded, nodes generated and peak recursion depth, updated in place.
+            - depth (int): The recursion depth of the current state, which is the size of the DFS frontier.
+
+        Returns:
+            - list: The path from the current state to the goal state as a list of states,
+                    or None if no path is found.
+        """
         # Return path if goal state is reached.
         if current_state == goal_state:
             return [current_state]
@@ -57,13 +160,18 @@ class Agent:
         visited.add(current_state)  # Add current state to the visited.
         callback(current_state)  # Update GUI
 
+        counts[0] += 1
+        if depth > counts[2]:
+            counts[2] = depth
+
         # Iterate through valid actions of the current state.
         for action in self.maze.valid_actions(current_state):
             next_state = self.maze.result_of_action(current_state, action)
 
             # Continue search from next state if not visited.
             if next_state not in visited:
-                path = self.dfs(next_state, goal_state, callback, visited)
+                counts[1] += 1
+                path = self._dfs(next_state, goal_state, callback, visited, counts, depth + 1)
 
                 # Return path including current state if path is found.
                 if path:
@@ -71,6 +179,7 @@ class Agent:
 
         return None  # Return None if no path is found.
 
+    @_instrumented
     def bfs(self, initial_state, goal_state, callback):
         """
         Performs Breadth-First Search (BFS) from the initial state to the goal state.
@@ -91,26 +200,36 @@ class Agent:
         # Enqueue the initial state with an empty path.
         queue.enqueue((initial_state, []))
 
-        while not queue.is_empty():
-            current_state, path = queue.dequeue()  # Dequeue the next state to visit.
-            if current_state in visited:
-                continue  # Skip if state has already been visited.
-
-            visited.add(current_state)  # Add current state to the visited.
-            callback(current_state)  # Update GUI
-
-            # Return path if goal state is reached.
-            if current_state == goal_state:
-                return path + [current_state]
-
-            # Explore all valid actions from the current state and enqueue new states to visit.
-            for action in self.maze.valid_actions(current_state):
-                next_state = self.maze.result_of_action(current_state, action)
-                if next_state not in visited:
-                    queue.enqueue((next_state, path + [current_state]))
-
-        return None  # Return None if no path is found.
-
+        # Count in locals and store them once the search ends, to keep the loop cheap.
+        expanded = enqueued = dequeued = peak_frontier = 0
+        try:
+            while not queue.is_empty():
+                peak_frontier = max(peak_frontier, len(queue.queue))
+                current_state, path = queue.dequeue()  # Dequeue the next state to visit.
+                dequeued += 1
+                if current_state in visited:
+                    continue  # Skip if state has already been visited.
+
+                visited.add(current_state)  # Add current state to the visited.
+                callback(current_state)  # Update GUI
+                expanded += 1
+
+                # Return path if goal state is reached.
+                if current_state == goal_state:
+                    return path + [current_state]
+
+                # Explore all valid actions from the current state and enqueue new states to visit.
+                for action in self.maze.valid_actions(current_state):
+                    next_state = self.maze.result_of_action(current_state, action)
+                    if next_state not in visited:
+                        queue.enqueue((next_state, path + [current_state]))
+                        enqueued += 1
+
+            return None  # Return None if no path is found.
+        finally:
+            self._record_counts(expanded, enqueued, enqueued + 1, dequeued, peak_frontier)
+
+    @_instrumented
     def a_star(self, initial_state, goal_state, callback):
         """
         Performs A* Search from the initial state to the goal state.
@@ -135,36 +254,753 @@ class Agent:
         # Distance from start to the current node.
         g_score = {initial_state: 0}
 
-        # Continue until there are no more states to explore.
-        while not priority_queue.is_empty():
-            f_score, g_score_current, current, path = priority_queue.pop()  # Pop state with the lowest f-score.
+        # Count in locals and store them once the search ends, to keep the loop cheap.
+        expanded = pushed = popped = peak_frontier = 0
+        try:
+            # Continue until there are no more states to explore.
+            while not priority_queue.is_empty():
+                peak_frontier = max(peak_frontier, len(priority_queue.heap))
+                f_score, g_score_current, current, path = priority_queue.pop()  # Pop state with the lowest f-score.
+                popped += 1
+
+                # Skip if state has already been visited.
+                if current in visited:
+                    continue
+
+                visited.add(current)  # Add current state to the visited.
+                callback(current)  # Update GUI
+                expanded += 1
+
+                # Return path if goal state is reached.
+                if current == goal_state:
+                    return path
+
+                for action in self.maze.valid_actions(current):
+                    next_cell = self.maze.result_of_action(current, action)
+                    tentative_g_score = g_score_current + 1
+
+                    if next_cell not in g_score or tentative_g_score < g_score[next_cell]:
+                        # Update g_score for next_cell if it's a better path.
+                        g_score[next_cell] = tentative_g_score
+
+                        # Calculate f_score.
+                        f_score_next = tentative_g_score + self.maze.heuristic(next_cell, goal_state)
 
-            # Skip if state has already been visited.
-            if current in visited:
-                continue
+                        # Append next_cell to the current path.
+                        new_path = path + [next_cell]
 
-            visited.add(current)  # Add current state to the visited.
-            callback(current)  # Update GUI
+                        # Add to the priority queue.
+                        priority_queue.push((f_score_next, tentative_g_score, next_cell, new_path))
+                        pushed += 1
+
+            return None  # Return None if no path to the goal state is found.
+        finally:
+            self._record_counts(expanded, pushed, pushed + 1, popped, peak_frontier)
+
+    def _record_counts(self, expanded, generated, pushes, pops, peak_frontier):
+        """
+        Adds the counters of a search loop to the agent's stats.
+
+        Parameters:
+            - expanded (int): Number of nodes expanded.
+            - generated (int): Number of successor nodes generated.
+            - pushes (int): Number of push or enqueue operations on the frontier.
+            - pops (int): Number of pop or dequeue operations on the frontier.
+            - peak_frontier (int): Largest frontier size seen.
+
+        Returns:
+            - None
+        """
+        stats = self.stats
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.pushes += pushes
+        stats.pops += pops
+        stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+
+    @_instrumented
+    def ida_star(self, initial_state, goal_state, callback, transposition_table=False):
+        """
+        Performs Iterative Deepening A* (IDA*) from the initial state to the goal state.
+
+        Each iteration is a depth-first search bounded by an f-score threshold, which is raised to the smallest
+        f-score that exceeded it until the goal is found. Only the current path is kept in memory, so memory use is
+        linear in the depth of the search at the cost of re-expanding nodes between iterations.
+
+        Parameters:
+            - initial_state (tuple): The initial state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - callback (function): A function to call for updating the GUI.
+            - transposition_table (bool, optional): If True, remember the lowest g-score reached for each state in the
+                                                    current iteration and prune paths that reach it again at no lower
+                                                    cost. Trades memory for fewer re-expansions. Defaults to False.
+
+        Returns:
+            - list: The path from the initial state to the goal state as a list of states,
+                    or None if no path is found.
+        """
+        bound = self.maze.heuristic(initial_state, goal_state)
+        previous_expanded = 0
+
+        # Keep deepening the f-score threshold until the goal is found or nothing is left beyond it.
+        while True:
+            table = {initial_state: 0} if transposition_table else None
+            path = [initial_state]
+            expanded_before = self.stats.nodes_expanded
+            self.stats.iterations += 1
+            with self.stats.phase(f"iteration {self.stats.iterations} (bound {bound})"):
+                result = self._ida_star_iteration(path, goal_state, bound, callback, table)
+
+            # Each iteration repeats the expansions of the previous one before going deeper. This only estimates
+            # re-expansions: counting them exactly would need a record of every expanded state, which is the memory
+            # IDA* avoids, and it misses states expanded twice within one iteration of a maze with loops.
+            expanded = self.stats.nodes_expanded - expanded_before
+            self.stats.re_expansions += min(previous_expanded, expanded)
+            previous_expanded = expanded
 
             # Return path if goal state is reached.
-            if current == goal_state:
+            if result is True:
                 return path
 
-            for action in self.maze.valid_actions(current):
-                next_cell = self.maze.result_of_action(current, action)
-                tentative_g_score = g_score_current + 1
+            # Return None if no state exceeded the threshold, so the goal is unreachable.
+            if result == math.inf:
+                return None
+
+            bound = result
+
+    def _ida_star_iteration(self, path, goal_state, bound, callback, table):
+        """
+        Runs a single f-bounded depth-first iteration of IDA*, extending path in place.
+
+        The search uses an explicit stack of action iterators instead of recursion so deep mazes do not hit the
+        interpreter's recursion limit.
+
+        Parameters:
+            - path (list): The path being searched, initially holding only the initial state.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - bound (int): The f-score threshold of this iteration.
+            - callback (function): A function to call for updating the GUI.
+            - table (dict): Lowest g-score seen per state in this iteration, or None to disable pruning.
+
+        Returns:
+            - bool | int | float: True if the goal was reached (path then holds the solution), otherwise the smallest
+                                  f-score that exceeded the threshold, or math.inf if there was none.
+        """
+        next_bound = math.inf
+        on_path = {path[0]}
+        actions = [None]  # Pending actions of each state on the path, None until the state is expanded.
+
+        # Count in locals and store them once the iteration ends, to keep the loop cheap.
+        expanded = pushed = popped = peak_frontier = peak_memory = 0
+        try:
+            while path:
+                current = path[-1]
+
+                if actions[-1] is None:
+                    f_score = len(path) - 1 + self.maze.heuristic(current, goal_state)
+
+                    # Cut off the branch and remember the smallest f-score beyond the threshold.
+                    if f_score > bound:
+                        next_bound = min(next_bound, f_score)
+                        on_path.discard(path.pop())
+                        actions.pop()
+                        popped += 1
+                        continue
+
+                    expanded += 1
+                    callback(current)  # Update GUI
+
+                    # Return if goal state is reached.
+                    if current == goal_state:
+                        return True
+
+                    actions[-1] = iter(self.maze.valid_actions(current))
+
+                action = next(actions[-1], None)
+
+                # Backtrack once every action of the current state has been tried.
+                if action is None:
+                    on_path.discard(path.pop())
+                    actions.pop()
+                    popped += 1
+                    continue
+
+                next_state = self.maze.result_of_action(current, action)
+
+                # Skip states already on the path to avoid cycles.
+                if next_state in on_path:
+                    continue
+
+                # Prune states already reached at no higher cost in this iteration.
+                if table is not None:
+                    g_score_next = len(path)
+                    if table.get(next_state, math.inf) <= g_score_next:
+                        continue
+                    table[next_state] = g_score_next
+
+                path.append(next_state)
+                on_path.add(next_state)
+                actions.append(None)
+                pushed += 1
+
+                peak_frontier = max(peak_frontier, len(path))
+                peak_memory = max(peak_memory, len(path) + (len(table) if table is not None else 0))
+
+            return next_bound
+        finally:
+            self._record_counts(expanded, pushed, pushed, popped, peak_frontier)
+            self.stats.peak_memory = max(self.stats.peak_memory, peak_memory)
+
+    @_instrumented
+    def sma_star(self, initial_state, goal_state, callback, memory_limit):
+        """
+        Performs Simplified Memory-Bounded A* (SMA*) from the initial state to the goal state.
+
+        SMA* behaves like A* until the number of nodes in memory reaches memory_limit. It then forgets the leaf with the
+        highest f-score (the shallowest one on ties) and backs its f-score up into the parent, so the forgotten subtree
+        is regenerated only once every cheaper option has been ruled out. The path found is optimal whenever the
+        optimal solution fits within the budget.
+
+        The priority queues skip outdated entries lazily and are rebuilt from the nodes in memory whenever they hold
+        more than four entries per node of the budget, so the whole search stays within O(memory_limit) memory.
+
+        Parameters:
+            - initial_state (tuple): The initial state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - callback (function): A function to call for updating the GUI.
+            - memory_limit (int): The maximum number of search nodes kept in memory. Must be at least 2.
+
+        Returns:
+            - list: The path from the initial state to the goal state as a list of states,
+                    or None if no path is found within the memory limit.
+        """
+        if memory_limit < 2:
+            raise ValueError("memory_limit must be at least 2.")
+
+        max_heap_entries = 4 * memory_limit
+
+        counter = itertools.count()  # Tie-breaker so heap entries never compare nodes.
+        open_heap = MinHeap()  # Entries of (f-score, -depth, id, version, node): lowest f, deepest first.
+        leaf_heap = MinHeap()  # Entries of (-f-score, depth, id, version, node): highest f, shallowest first.
+
+        root = _SMANode(initial_state, None, 0, self.maze.heuristic(initial_state, goal_state))
+        open_heap.push((root.f, 0, next(counter), root.version, root))
+        in_memory = 1
+        in_open = 1  # Nodes in memory that are waiting in OPEN.
+
+        # Count in locals and store them once the search ends, to keep the loop cheap.
+        expanded = re_expansions = generated = popped = peak_frontier = peak_memory = 0
+        pushed = 1
+        try:
+            while not open_heap.is_empty():
+                # Drop outdated entries, and the forgotten nodes they keep alive, once they outgrow the budget.
+                if len(open_heap.heap) + len(leaf_heap.heap) > max_heap_entries:
+                    open_heap, leaf_heap, rebuild_pushes = self._sma_star_rebuild(root, counter)
+                    pushed += rebuild_pushes
+
+                peak_frontier = max(peak_frontier, in_open)
+                peak_memory = max(peak_memory, in_memory + len(open_heap.heap) + len(leaf_heap.heap))
+
+                key, _, _, version, node = open_heap.pop()
+                popped += 1
+
+                # Skip stale entries of forgotten or updated nodes.
+                if not node.alive or version != node.version:
+                    continue
+
+                # Every remaining option exceeds the memory limit.
+                if key == math.inf:
+                    return None
+
+                # Return path if goal state is reached.
+                if node.state == goal_state:
+                    path = []
+                    while node is not None:
+                        path.append(node.state)
+                        node = node.parent
+                    return path[::-1]
+
+                expanded += 1
+                callback(node.state)  # Update GUI
+
+                # Generate every successor on first expansion, otherwise regenerate the forgotten ones.
+                if node.expanded:
+                    re_expansions += 1
+                    successors = list(node.forgotten)
+                else:
+                    parent_state = node.parent.state if node.parent is not None else None
+                    successors = [self.maze.result_of_action(node.state, action)
+                                  for action in self.maze.valid_actions(node.state)]
+                    successors = [state for state in successors if state != parent_state]
+                    node.expanded = True
+
+                # Score every successor before any of them is added, so forgetting leaves below sees a settled node.
+                scored = []
+                for next_state in successors:
+                    g_score_next = node.g + 1
+                    f_score_next = max(node.f, g_score_next + self.maze.heuristic(next_state, goal_state))
+                    f_score_next = max(f_score_next, node.forgotten.pop(next_state, 0))
+
+                    # A non-goal node at the deepest level the budget allows can never lead to a solution.
+                    if next_state != goal_state and g_score_next >= memory_limit - 1:
+                        f_score_next = math.inf
+
+                    scored.append((next_state, g_score_next, f_score_next))
+
+                # The node leaves OPEN unless some of its successors are still forgotten.
+                in_open += node.in_open() - 1
+
+                for next_state, g_score_next, f_score_next in scored:
+                    child = _SMANode(next_state, node, g_score_next, f_score_next)
+                    node.children.append(child)
+                    node.version += 1
+                    in_memory += 1
+                    in_open += 1
+                    open_heap.push((child.f, -child.g, next(counter), child.version, child))
+                    leaf_heap.push((-child.f, child.g, next(counter), child.version, child))
+                    generated += 1
+                    pushed += 2
+
+                    # Forget the worst leaves until the budget is met again.
+                    while in_memory > memory_limit:
+                        open_change, forget_pushes, forget_pops = self._sma_star_forget(leaf_heap, open_heap, counter)
+                        in_open += open_change
+                        pushed += forget_pushes
+                        popped += forget_pops
+                        in_memory -= 1
+
+                self._sma_star_backup(node)
+
+                node.version += 1
+                if node.forgotten:
+                    open_heap.push((min(node.forgotten.values()), -node.g, next(counter), node.version, node))
+                    pushed += 1
+                if not node.children:
+                    leaf_heap.push((-node.f, node.g, next(counter), node.version, node))
+                    pushed += 1
+
+            return None  # Return None if no path to the goal state is found.
+        finally:
+            self._record_counts(expanded, generated, pushed, popped, peak_frontier)
+            self.stats.re_expansions += re_expansions
+            self.stats.peak_memory = max(self.stats.peak_memory, peak_memory)
+
+    def _sma_star_forget(self, leaf_heap, open_heap, counter):
+        """
+        Removes the worst leaf from memory and records its f-score in its parent.
+
+        Parameters:
+            - leaf_heap (MinHeap): Leaves ordered by highest f-score, shallowest first.
+            - open_heap (MinHeap): Frontier ordered by lowest f-score, deepest first.
+            - counter (itertools.count): Tie-breaker for heap entries.
+
+        Returns:
+            - tuple: The change in the number of nodes in memory that are waiting in OPEN, and the number of heap
+                     pushes and pops made.
+        """
+        popped = 0
+        while True:
+            _, _, _, version, leaf = leaf_heap.pop()
+            popped += 1
+            if leaf.alive and version == leaf.version and not leaf.children and leaf.parent is not None:
+                break
+
+        parent = leaf.parent
+        open_change = -leaf.in_open() - parent.in_open()
+
+        leaf.alive = False
+        parent.children.remove(leaf)
+        parent.forgotten[leaf.state] = leaf.f
+        self._sma_star_backup(parent)
+
+        # The parent must be expanded again to regenerate what was forgotten.
+        parent.version += 1
+        open_heap.push((min(parent.forgotten.values()), -parent.g, next(counter), parent.version, parent))
+        pushed = 1
+        if not parent.children:
+            leaf_heap.push((-parent.f, parent.g, next(counter), parent.version, parent))
+            pushed += 1
+
+        return open_change + parent.in_open(), pushed, popped
+
+    @staticmethod
+    def _sma_star_rebuild(root, counter):
+        """
+        Rebuilds the SMA* priority queues from the nodes in memory, dropping every outdated entry.
 
-                if next_cell not in g_score or tentative_g_score < g_score[next_cell]:
-                    # Update g_score for next_cell if it's a better path.
-                    g_score[next_cell] = tentative_g_score
+        Parameters:
+            - root (_SMANode): The root of the search tree in memory.
+            - counter (itertools.count): Tie-breaker for heap entries.
 
-                    # Calculate f_score.
-                    f_score_next = tentative_g_score + self.maze.heuristic(next_cell, goal_state)
+        Returns:
+            - tuple: The new open heap and leaf heap, and the number of heap pushes made.
+        """
+        open_heap = MinHeap()
+        leaf_heap = MinHeap()
+        pushed = 0
+
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+
+            if node.in_open():
+                key = min(node.forgotten.values()) if node.expanded else node.f
+                open_heap.push((key, -node.g, next(counter), node.version, node))
+                pushed += 1
+            if not node.children and node.parent is not None:
+                leaf_heap.push((-node.f, node.g, next(counter), node.version, node))
+                pushed += 1
+
+        return open_heap, leaf_heap, pushed
+
+    @staticmethod
+    def _sma_star_backup(node):
+        """
+        Updates the f-score of an expanded node and its ancestors to the best f-score among their successors.
 
-                    # Append next_cell to the current path.
-                    new_path = path + [next_cell]
+        Parameters:
+            - node (_SMANode): The node whose successors changed.
 
-                    # Add to the priority queue.
-                    priority_queue.push((f_score_next, tentative_g_score, next_cell, new_path))
+        Returns:
+            - None
+        """
+        while node is not None and node.expanded:
+            best = min([child.f for child in node.children] + list(node.forgotten.values()), default=math.inf)
+            if best == node.f:
+                break
+            node.f = best
+            node = node.parent
+
+    @_instrumented
+    def ara_star(self, initial_state, goal_state, callback, epsilon=2.5, epsilon_step=0.5, time_limit=None):
+        """
+        Performs Anytime Repairing A* (ARA*) from the initial state to the goal state.
 
-        return None  # Return None if no path to the goal state is found.
+        The search starts as weighted A* with the heuristic inflated by epsilon, which quickly finds a path costing at
+        most epsilon times the optimal one. Epsilon is then lowered by epsilon_step and the search is repaired rather
+        than restarted: g-scores are kept and only states whose g-score improved are expanded again. This repeats until
+        the path is proven optimal or the time limit runs out.
+
+        Parameters:
+            - initial_state (tuple): The initial state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - callback (function): A function to call for updating the GUI.
+            - epsilon (float, optional): The initial heuristic inflation factor, at least 1. Defaults to 2.5.
+            - epsilon_step (float, optional): The amount epsilon is lowered by after each search, greater than 0.
+                                              Defaults to 0.5.
+            - time_limit (float, optional): Seconds allowed for the whole search, or None for no limit.
+                                            Defaults to None.
+
+        Returns:
+            - tuple: The best path found as a list of states (or None if no path was found in time), and its proven
+                     suboptimality bound: the path costs at most bound times the optimal cost (math.inf if no path).
+        """
+        if epsilon < 1:
+            raise ValueError("epsilon must be at least 1.")
+        if epsilon_step <= 0:
+            raise ValueError("epsilon_step must be positive.")
+
+        stop_time = time.perf_counter() + time_limit if time_limit is not None else math.inf
+
+        # Search state shared by every iteration, so each one repairs the previous search.
+        g_score = {initial_state: 0}
+        parent = {initial_state: None}
+        open_states = {initial_state}
+        closed = set()
+        incons = set()  # Closed states whose g-score improved, expanded again in the next iteration.
+        expanded = set()  # States expanded in any iteration, to count re-expansions.
+        priority_queue = MinHeap()
+        priority_queue.push((epsilon * self.maze.heuristic(initial_state, goal_state), 0, initial_state))
+        self.stats.pushes += 1
+
+        best_path, best_bound = None, math.inf
+
+        while True:
+            self.stats.iterations += 1
+            with self.stats.phase(f"iteration {self.stats.iterations} (epsilon {epsilon:g})"):
+                completed = self._ara_star_improve_path(priority_queue, g_score, parent, open_states, closed, incons,
+                                                        expanded, goal_state, epsilon, callback, stop_time)
+
+            # Return the best path so far once the time limit runs out.
+            if not completed:
+                return best_path, best_bound
+
+            # Return None if the goal state is unreachable.
+            if goal_state not in g_score:
+                return None, math.inf
+
+            # The cost of the optimal path is at least the lowest g + h of any state that could still improve it.
+            candidates = open_states | incons
+            lower_bound = min((g_score[state] + self.maze.heuristic(state, goal_state) for state in candidates),
+                              default=g_score[goal_state])
+            best_bound = max(1.0, min(epsilon, g_score[goal_state] / lower_bound if lower_bound else 1.0))
+
+            best_path = [goal_state]
+            while parent[best_path[-1]] is not None:
+                best_path.append(parent[best_path[-1]])
+            best_path.reverse()
+
+            # Return path if it is proven optimal or there is no time left to improve it.
+            if best_bound == 1.0 or time.perf_counter() >= stop_time:
+                return best_path, best_bound
+
+            # Tighten epsilon and requeue the open and inconsistent states with their new f-scores.
+            epsilon = max(1.0, epsilon - epsilon_step)
+            open_states |= incons
+            incons.clear()
+            closed.clear()
+            priority_queue = MinHeap()
+            for state in open_states:
+                # Rebuilding a large OPEN set must not overrun the time limit either.
+                if time.perf_counter() >= stop_time:
+                    return best_path, best_bound
+
+                f_score = g_score[state] + epsilon * self.maze.heuristic(state, goal_state)
+                priority_queue.push((f_score, g_score[state], state))
+                self.stats.pushes += 1
+
+    def _ara_star_improve_path(self, priority_queue, g_score, parent, open_states, closed, incons, expanded,
+                               goal_state, epsilon, callback, stop_time):
+        """
+        Runs a single weighted A* iteration of ARA*, updating the shared search state in place.
+
+        Parameters:
+            - priority_queue (MinHeap): Open states as tuples of (f-score, g-score, state); stale entries are skipped.
+            - g_score (dict): Best known distance from the initial state to each state.
+            - parent (dict): The state each state was best reached from.
+            - open_states (set): States waiting to be expanded in this iteration.
+            - closed (set): States expanded in this iteration.
+            - incons (set): Closed states whose g-score improved after their expansion.
+            - expanded (set): States expanded in any iteration of the search.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - epsilon (float): The heuristic inflation factor of this iteration.
+            - callback (function): A function to call for updating the GUI.
+            - stop_time (float): The time.perf_counter() value at which the search must stop.
+
+        Returns:
+            - bool: True if the iteration completed, False if it was cut short by the time limit.
+        """
+        # Count in locals and store them once the iteration ends, to keep the loop cheap.
+        expansions = re_expansions = generated = pushed = popped = peak_frontier = 0
+        try:
+            while not priority_queue.is_empty():
+                f_score, g_score_current, current = priority_queue.peek()
+
+                # Skip stale entries of states that were expanded or reached more cheaply since.
+                if current not in open_states or g_score_current != g_score[current]:
+                    priority_queue.pop()
+                    popped += 1
+                    continue
+
+                # Stop once no open state can lead to a cheaper path to the goal state.
+                if f_score >= g_score.get(goal_state, math.inf):
+                    return True
+
+                if time.perf_counter() >= stop_time:
+                    return False
+
+                peak_frontier = max(peak_frontier, len(priority_queue.heap))
+                priority_queue.pop()
+                popped += 1
+                open_states.discard(current)
+                closed.add(current)
+                callback(current)  # Update GUI
+
+                expansions += 1
+                if current in expanded:
+                    re_expansions += 1
+                else:
+                    expanded.add(current)
+
+                for action in self.maze.valid_actions(current):
+                    next_cell = self.maze.result_of_action(current, action)
+                    tentative_g_score = g_score_current + 1
+
+                    if tentative_g_score < g_score.get(next_cell, math.inf):
+                        g_score[next_cell] = tentative_g_score
+                        parent[next_cell] = current
+                        generated += 1
+
+                        # Closed states are deferred to the next iteration instead of being expanded twice.
+                        if next_cell in closed:
+                            incons.add(next_cell)
+                        else:
+                            open_states.add(next_cell)
+                            f_score_next = tentative_g_score + epsilon * self.maze.heuristic(next_cell, goal_state)
+                            priority_queue.push((f_score_next, tentative_g_score, next_cell))
+                            pushed += 1
+
+            return True
+        finally:
+            self._record_counts(expansions, generated, pushed, popped, peak_frontier)
+            self.stats.re_expansions += re_expansions
+
+    @_instrumented
+    def dead_end_filling(self, initial_state, goal_state, callback):
+        """
+        Solves the maze by dead-end filling instead of frontier search.
+
+        Every cell other than the initial and goal states with at most one open neighbour is a dead end. Filling a
+        dead end may turn its neighbour into one, so dead ends are pruned from a work list until none remain, which
+        takes linear time. In a perfect maze only the solution path is left; in a maze with loops a BFS over the cells
+        left unfilled picks the shortest path among them. The open-neighbour counts are kept in flat arrays indexed by
+        cell, so multi-million-cell mazes are solved in seconds.
+
+        Because the result is always a shortest path, it can be used to validate the paths returned by the other
+        search algorithms.
+
+        Parameters:
+            - initial_state (tuple): The initial state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - callback (function): A function to call for updating the GUI, called with each filled cell.
+
+        Returns:
+            - list: The path from the initial state to the goal state as a list of states,
+                    or None if no path is found.
+        """
+        cols = self.maze.cols
+        size = self.maze.rows * cols
+        start = (initial_state[0] - 1) * cols + initial_state[1] - 1
+        goal = (goal_state[0] - 1) * cols + goal_state[1] - 1
+
+        stats = self.stats
+
+        with stats.phase('encode'):
+            # Encode the open walls of each cell as a bit mask and count its open neighbours.
+            open_mask = self.maze.wall_masks()
+            mask_degrees = bytes(bin(mask).count('1') for mask in range(256))
+            degree = array('B', open_mask.tobytes().translate(mask_degrees))
+
+            # Index offsets of the open neighbours for every possible wall mask.
+            action_offsets = {'R': cols, 'L': -cols, 'U': -1, 'D': 1}
+            neighbour_offsets = [tuple(action_offsets[action] for action, bit in self.maze.ACTION_BITS.items()
+                                       if mask & bit) for mask in range(16)]
+
+        with stats.phase('fill'):
+            # Fill dead ends until none remain, never filling the initial or goal state.
+            filled = bytearray(size)
+            dead_ends = [index for index in range(size) if degree[index] <= 1 and index != start and index != goal]
+            peak_frontier = len(dead_ends)
+            while dead_ends:
+                index = dead_ends.pop()
+                filled[index] = 1
+                callback((index // cols + 1, index % cols + 1))  # Update GUI
+
+                for offset in neighbour_offsets[open_mask[index]]:
+                    neighbour = index + offset
+                    if not filled[neighbour]:
+                        degree[neighbour] -= 1
+                        if degree[neighbour] == 1 and neighbour != start and neighbour != goal:
+                            dead_ends.append(neighbour)
+                            if len(dead_ends) > peak_frontier:
+                                peak_frontier = len(dead_ends)
+
+            # Every dead end pushed on the work list is popped and filled exactly once.
+            filled_count = filled.count(1)
+            self._record_counts(filled_count, 0, filled_count, filled_count, peak_frontier)
+
+        with stats.phase('path'):
+            # Search the remaining cells level by level, recording each cell's parent.
+            parent = array('l', [-1]) * size
+            parent[start] = start
+            frontier = [start]
+            expanded = generated = peak_frontier = 0
+            while frontier and parent[goal] == -1:
+                expanded += len(frontier)
+                peak_frontier = max(peak_frontier, len(frontier))
+                next_frontier = []
+                for index in frontier:
+                    for offset in neighbour_offsets[open_mask[index]]:
+                        neighbour = index + offset
+                        if not filled[neighbour] and parent[neighbour] == -1:
+                            parent[neighbour] = index
+                            next_frontier.append(neighbour)
+                generated += len(next_frontier)
+                frontier = next_frontier
+            self._record_counts(expanded, generated, generated + 1, expanded, peak_frontier)
+
+            # Return None if the goal state is not connected to the initial state.
+            if parent[goal] == -1:
+                return None
+
+            # Walk the parents back from the goal state to rebuild the path.
+            path = [goal_state]
+            index = goal
+            while index != start:
+                index = parent[index]
+                path.append((index // cols + 1, index % cols + 1))
+            return path[::-1]
+
+    def record_trace(self, algorithm, initial_state, goal_state, **kwargs):
+        """
+        Runs a search without a GUI and records its expansion order and final path. For ARA* the proven suboptimality
+        bound of the path is recorded as well.
+
+        Parameters:
+            - algorithm (str): The search to run: 'DFS', 'BFS', 'A*', 'IDA*', 'SMA*', 'ARA*' or 'Dead-end filling'.
+            - initial_state (tuple): The initial state of the agent in the maze.
+            - goal_state (tuple): The goal state that the agent aims to reach.
+            - **kwargs: Extra arguments for the search, such as memory_limit for SMA* or time_limit for ARA*.
+
+        Returns:
+            - SearchTrace: The recorded trace, ready to be saved or replayed.
+        """
+        searches = {
+            'DFS': self.dfs,
+            'BFS': self.bfs,
+            'A*': self.a_star,
+            'IDA*': self.ida_star,
+            'SMA*': self.sma_star,
+            'ARA*': self.ara_star,
+            'Dead-end filling': self.dead_end_filling,
+        }
+        if algorithm not in searches:
+            raise ValueError(f"Unknown search algorithm: {algorithm}")
+
+        trace = SearchTrace.from_maze(self.maze, algorithm, initial_state, goal_state)
+        path = searches[algorithm](initial_state, goal_state, trace.record, **kwargs)
+
+        # ARA* returns the path together with its suboptimality bound.
+        if algorithm == 'ARA*':
+            path, trace.bound = path
+
+        trace.set_path(path)
+        return trace
+
+
+class _SMANode:
+    """A search tree node kept in memory by SMA*."""
+    __slots__ = ('state', 'parent', 'g', 'f', 'children', 'forgotten', 'expanded', 'alive', 'version')
+
+    def __init__(self, state, parent, g, f):
+        """
+        Initializes the node.
+
+        Parameters:
+            - state (tuple): The maze cell represented by the node.
+            - parent (_SMANode): The node this one was generated from, or None for the root.
+            - g (int): Path cost from the initial state.
+            - f (int | float): Estimated total cost through this node.
+
+        Returns:
+            - None
+        """
+        self.state = state
+        self.parent = parent
+        self.g = g
+        self.f = f
+        self.children = []
+        self.forgotten = {}  # Forgotten successor states mapped to their last known f-score.
+        self.expanded = False
+        self.alive = True
+        self.version = 0  # Bumped whenever heap entries for this node become stale.
+
+    def in_open(self):
+        """
+        Checks whether the node is waiting in OPEN: it has not been expanded yet, or some successors were forgotten.
+
+        Returns:
+            - bool: True if the node belongs in OPEN, False otherwise.
+        """
+        return not self.expanded or bool(self.forgotten)
@@ -1,13 +1,15 @@
 """
-This module provides implementation of Queue and MinHeap data structures.
+This module provides implementation of Queue, MinHeap and UnionFind data structures.
 
 These data structures are essential for algorithmic operations, such as search algorithms. The Queue class implements
 a standard FIFO (First In, First Out) queue, while the MinHeap class provides a min-heap for efficient priority queue
-operations.
+operations. The UnionFind class tracks disjoint sets of cells for maze generation and validation.
 
 Author: Peyman Kh
 Date: 06/Feb/2024
 """
+# Import libraries
+from array import array
 
 
 class Queue:
@@ -97,6 +99,18 @@ class MinHeap:
 
         return top_value
 
+    def peek(self):
+        """
+        Returns the smallest element of the min-heap without removing it. Like pop(), and unlike Queue.peek(), it
+        returns None instead of raising when the heap is empty.
+
+        Returns:
+            - any: The smallest element of the min-heap, or None if the heap is empty.
+        """
+        if not self.heap:
+            return None
+        return self.heap[0]
+
     def _heapify_up(self, index):
         """
         Move the item at the given index up to its correct position.
@@ -157,3 +171,68 @@ class MinHeap:
             - bool: True if the min-heap is empty, False otherwise.
         """
         return len(self.heap) == 0
+
+
+class UnionFind:
+    """Implements a disjoint-set forest over the integers 0..size-1 with path compression and union by rank."""
+    def __init__(self, size):
+        """
+        Initializes every element in a set of its own.
+
+        Parameters:
+            - size (int): The number of elements.
+
+        Attributes:
+            - parent (array.array): Flat array holding the parent of each element; roots are their own parent.
+            - rank (array.array): Upper bound on the height of each root's tree.
+            - components (int): The number of disjoint sets.
+        """
+        self.parent = array('l', range(size))
+        self.rank = array('B', bytes(size))
+        self.components = size
+
+    def find(self, element):
+        """
+        Finds the representative of the set containing an element, compressing the path to it.
+
+        Parameters:
+            - element (int): The element to look up.
+
+        Returns:
+            - int: The root of the element's set.
+        """
+        parent = self.parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+
+        # Point every element on the path directly at the root.
+        while parent[element] != root:
+            parent[element], element = root, parent[element]
+
+        return root
+
+    def union(self, first, second):
+        """
+        Merges the sets containing two elements, attaching the shorter tree under the taller one.
+
+        Parameters:
+            - first (int): An element of the first set.
+            - second (int): An element of the second set.
+
+        Returns:
+            - bool: True if the sets were merged, False if both elements were already in the same set.
+        """
+        first_root = self.find(first)
+        second_root = self.find(second)
+        if first_root == second_root:
+            return False
+
+        if self.rank[first_root] < self.rank[second_root]:
+            first_root, second_root = second_root, first_root
+        self.parent[second_root] = first_root
+        if self.rank[first_root] == self.rank[second_root]:
+            self.rank[first_root] += 1
+
+        self.components -= 1
+        return True
@@ -5,6 +5,8 @@ solver aims to find a path from the start to the end of the maze using various a
 
 Methods:
     - create_maze(): Generates the maze by removing walls between cells using a depth-first search algorithm.
+    - create_maze_kruskal(): Generates a perfect maze using randomized Kruskal's algorithm.
+    - validate(): Checks that the maze is connected and has no loops.
     - _continues_straight_path(cell1, cell2): Checks if moving from cell1 to cell2 continues a straight path.
     - _blocked_neighbours(cell): Finds all neighbouring cells of a given cell that have all walls intact.
     - _remove_wall_in_between(cell1, cell2): Removes the wall between two adjacent cells.
@@ -12,6 +14,8 @@ Methods:
     - valid_actions(cell): Returns a list of valid actions for a given cell.
     - result_of_action(cell, action): Returns the cell resulting from taking an action from a given cell.
     - heuristic(cell, goal): Calculates the Manhattan distance from a cell to the goal.
+    - wall_masks(): Encodes the open walls of every cell as a compact array of bit masks.
+    - load_wall_masks(masks): Restores the maze layout from an array of bit masks.
     - run(): Generates the maze and displays it using tkinter.
 
 Author: Peyman Kh
@@ -20,10 +24,16 @@ Date: 07/Feb/2024
 # Import Libraries
 import tkinter as tk  # For GUI creation.
 import random  # For random selections, necessary in maze generation.
+from array import array  # For compact wall encodings.
+from dataStructure import UnionFind  # For Kruskal's algorithm and maze validation.
 
 
 class Maze:
     """A class representing a maze with cells that can be navigated through by removing walls between them."""
+
+    # Bit used for each open wall in a cell's wall mask.
+    ACTION_BITS = {'R': 1, 'L': 2, 'U': 4, 'D': 8}
+
     def __init__(self, rows=30, cols=30):
         """
         Initializes the Maze with a specified number of rows and columns.
@@ -80,6 +90,86 @@ class Maze:
             if not neighbors:
                 stack.pop()
 
+    def create_maze_kruskal(self):
+        """
+        Generates a perfect maze using randomized Kruskal's algorithm. Every wall between two adjacent cells is shuffled
+        in a single pass and then removed in that order whenever it separates two cells that are not yet connected,
+        which yields a random perfect maze without the long corridors of create_maze(). Like any randomized Kruskal
+        maze, it favours many short dead ends rather than sampling spanning trees uniformly.
+
+        Returns:
+            - None
+        """
+        rows, cols = self.rows, self.cols
+        size = rows * cols
+
+        # Encode each inner wall as cell index * 2, plus 1 for the wall below the cell rather than to its right.
+        edges = list(range(0, (rows - 1) * cols * 2, 2))
+        edges.extend(index * 2 + 1 for index in range(size) if index % cols != cols - 1)
+        random.shuffle(edges)
+
+        union_find = UnionFind(size)
+        union = union_find.union
+        maze_map = self.maze_map
+        for edge in edges:
+            index = edge >> 1
+            neighbour = index + 1 if edge & 1 else index + cols
+
+            # Remove the wall only if it joins two separate regions, so no loop is created.
+            if union(index, neighbour):
+                x, y = index // cols + 1, index % cols + 1
+                if edge & 1:
+                    maze_map[(x, y)]['D'] = True
+                    maze_map[(x, y + 1)]['U'] = True
+                else:
+                    maze_map[(x, y)]['R'] = True
+                    maze_map[(x + 1, y)]['L'] = True
+
+                if union_find.components == 1:
+                    break
+
+    def validate(self):
+        """
+        Checks that the maze is perfect: every cell is reachable from every other one through exactly one path. Each
+        open wall is merged into a union-find, so the check runs in near-linear time and can be used before expensive
+        batch solves.
+
+        Returns:
+            - bool: True if the walls are consistent between neighbours, the border is closed and the maze is both
+                    connected and free of loops, False otherwise.
+        """
+        rows, cols = self.rows, self.cols
+        masks = self.wall_masks()
+        bits = self.ACTION_BITS
+        union_find = UnionFind(rows * cols)
+
+        for index, mask in enumerate(masks):
+            x, y = index // cols + 1, index % cols + 1
+
+            # Openings through the border of the maze are invalid.
+            if (x == 1 and mask & bits['L']) or (y == 1 and mask & bits['U']):
+                return False
+            if (x == rows and mask & bits['R']) or (y == cols and mask & bits['D']):
+                return False
+
+            for action, reverse, offset in (('R', 'L', cols), ('D', 'U', 1)):
+                if mask & bits[action]:
+                    # The neighbour must agree that the wall is open.
+                    if not masks[index + offset] & bits[reverse]:
+                        return False
+
+                    # Joining two cells that are already connected closes a loop.
+                    if not union_find.union(index, index + offset):
+                        return False
+
+            # A wall open on the neighbour's side only is inconsistent too.
+            if x < rows and not mask & bits['R'] and masks[index + cols] & bits['L']:
+                return False
+            if y < cols and not mask & bits['D'] and masks[index + 1] & bits['U']:
+                return False
+
+        return union_find.components == 1
+
     def _continues_straight_path(self, cell1, cell2):
         """
         Determines if moving from cell1 to cell2 would continue a straight path from the last state.
@@ -254,6 +344,37 @@ class Maze:
         # The Manhattan distance is the sum of the absolute differences in the x and y coordinates.
         return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
 
+    def wall_masks(self):
+        """
+        Encodes the open walls of every cell as a bit mask, using the bits in ACTION_BITS.
+
+        Returns:
+            - array.array: One unsigned byte per cell, indexed by (x - 1) * cols + (y - 1).
+        """
+        masks = array('B', bytes(self.rows * self.cols))
+        for (x, y), walls in self.maze_map.items():
+            mask = 0
+            for action, is_open in walls.items():
+                if is_open:
+                    mask |= self.ACTION_BITS[action]
+            masks[(x - 1) * self.cols + y - 1] = mask
+        return masks
+
+    def load_wall_masks(self, masks):
+        """
+        Restores the maze layout from bit masks produced by wall_masks().
+
+        Parameters:
+            - masks (array.array): One wall mask per cell, indexed by (x - 1) * cols + (y - 1).
+
+        Returns:
+            - None
+        """
+        for (x, y), walls in self.maze_map.items():
+            mask = masks[(x - 1) * self.cols + y - 1]
+            for action, bit in self.ACTION_BITS.items():
+                walls[action] = bool(mask & bit)
+
     def run(self):
         """Generates the maze and displays it using tkinter. This is the main
            method to start the maze generation and visualization process."""
@@ -0,0 +1,183 @@
+"""
+This module provides the SearchStats class, which collects instrumentation for a single search of the Agent.
+
+Every Agent search fills in a SearchStats with the nodes it expanded and generated, its peak frontier size, its heap or
+queue operations, its re-expansions and the wall time of each of its phases. Optional cProfile and tracemalloc results
+can be attached around a search, and the whole record can be exported as JSON.
+
+Methods:
+    - reset(algorithm): Clears every statistic before a new search.
+    - phase(name): Context manager that adds the wall time of a block to a named phase.
+    - record_profile(profiler, limit): Stores the most expensive functions of a cProfile run.
+    - record_memory(before, after, peak, limit): Stores the peak and top allocation sites of a tracemalloc run.
+    - to_dict(): Returns the statistics as a dictionary.
+    - to_json(): Returns the statistics as a JSON string.
+    - save_json(file_path): Writes the statistics to a JSON file.
+
+Author: Peyman Kh
+Date: 19/Oct/2026
+"""
+# Import libraries
+import json
+import pstats
+import time
+from contextlib import contextmanager
+
+
+class SearchStats:
+    """Statistics collected during a single search."""
+
+    def __init__(self, algorithm=None):
+        """
+        Initializes empty statistics.
+
+        Parameters:
+            - algorithm (str, optional): The name of the search being measured. Defaults to None.
+
+        Attributes:
+            - algorithm (str): The name of the search being measured.
+            - nodes_expanded (int): Number of nodes expanded.
+            - nodes_generated (int): Number of successor nodes generated.
+            - re_expansions (int): Number of expansions of a node that had already been expanded in the same search.
+                                   For IDA*, which keeps no record of expanded nodes, it is an estimate of the
+                                   work repeated between iterations instead.
+            - peak_frontier (int): Largest number of nodes waiting in the frontier (queue, heap or stack).
+            - peak_memory (int): Largest number of search nodes held in memory, reported by IDA* and SMA*. For SMA* it
+                                 also counts the entries held by its priority queues.
+            - pushes (int): Number of push or enqueue operations on the frontier.
+            - pops (int): Number of pop or dequeue operations on the frontier.
+            - iterations (int): Number of iterations of iterative searches such as IDA* and ARA*.
+            - phase_times (dict): Wall time in seconds of each phase, including 'total' for the whole search.
+            - profile (list): The most expensive functions of the search, if CPU profiling was enabled.
+            - memory_peak_bytes (int): Peak memory traced during the search, if memory profiling was enabled.
+            - memory_top (list): The allocation sites that grew most during the search, if memory profiling was enabled.
+        """
+        self.reset(algorithm)
+
+    def reset(self, algorithm=None):
+        """
+        Clears every statistic before a new search.
+
+        Parameters:
+            - algorithm (str, optional): The name of the search being measured. Defaults to None.
+
+        Returns:
+            - None
+        """
+        self.algorithm = algorithm
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.re_expansions = 0
+        self.peak_frontier = 0
+        self.peak_memory = 0
+        self.pushes = 0
+        self.pops = 0
+        self.iterations = 0
+        self.phase_times = {}
+        self.profile = None
+        self.memory_peak_bytes = None
+        self.memory_top = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Adds the wall time spent inside the with-block to the named phase.
+
+        Parameters:
+            - name (str): The name of the phase.
+
+        Returns:
+            - None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+
+    def record_profile(self, profiler, limit=20):
+        """
+        Stores the functions with the highest cumulative time from a cProfile run.
+
+        Parameters:
+            - profiler (cProfile.Profile): The disabled profiler that ran around the search.
+            - limit (int): The number of functions to keep (Defaults to 20).
+
+        Returns:
+            - None
+        """
+        entries = []
+        for (file_name, line, function), (_, calls, total, cumulative, _) in pstats.Stats(profiler).stats.items():
+            entries.append({
+                'function': f"{file_name}:{line}({function})",
+                'calls': calls,
+                'total_time': total,
+                'cumulative_time': cumulative,
+            })
+        entries.sort(key=lambda entry: entry['cumulative_time'], reverse=True)
+        self.profile = entries[:limit]
+
+    def record_memory(self, before, after, peak, limit=10):
+        """
+        Stores the peak traced memory and the allocation sites that grew most between two tracemalloc snapshots.
+
+        Parameters:
+            - before (tracemalloc.Snapshot): The snapshot taken before the search.
+            - after (tracemalloc.Snapshot): The snapshot taken after the search.
+            - peak (int): The peak traced memory in bytes during the search.
+            - limit (int): The number of allocation sites to keep (Defaults to 10).
+
+        Returns:
+            - None
+        """
+        self.memory_peak_bytes = peak
+        self.memory_top = [{'location': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                           for stat in after.compare_to(before, 'lineno')[:limit]]
+
+    def to_dict(self):
+        """
+        Returns the statistics as a dictionary.
+
+        Returns:
+            - dict: Every statistic keyed by its attribute name.
+        """
+        return {
+            'algorithm': self.algorithm,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            're_expansions': self.re_expansions,
+            'peak_frontier': self.peak_frontier,
+            'peak_memory': self.peak_memory,
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'iterations': self.iterations,
+            'phase_times': dict(self.phase_times),
+            'profile': self.profile,
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'memory_top': self.memory_top,
+        }
+
+    def to_json(self, indent=2):
+        """
+        Returns the statistics as a JSON string.
+
+        Parameters:
+            - indent (int): The indentation of the JSON output (Defaults to 2).
+
+        Returns:
+            - str: The statistics encoded as JSON.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def save_json(self, file_path):
+        """
+        Writes the statistics to a JSON file.
+
+        Parameters:
+            - file_path (str): The path of the file to write.
+
+        Returns:
+            - None
+        """
+        with open(file_path, 'w') as file:
+            file.write(self.to_json())
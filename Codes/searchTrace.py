@@ -0,0 +1,266 @@
+"""
+This module provides the SearchTrace class, a compact recording of a search through a maze.
+
+A trace holds the maze layout, the order in which the search expanded cells and the final path, with every cell stored
+as a flat index in an array('I'). Its record method can be passed to any Agent search as the callback, so a search can
+be captured headlessly once, saved to a small binary file and replayed later by the UI without recomputation.
+
+Methods:
+    - from_maze(maze, algorithm, initial_state, goal_state): Creates an empty trace for a search of the given maze.
+    - record(state): Appends an expanded state to the trace; meant to be used as a search callback.
+    - set_path(path): Stores the final path found by the search.
+    - expanded_state(step): Returns the state expanded at a given step.
+    - path_states(): Returns the final path as a list of states.
+    - to_maze(): Rebuilds the maze the trace was recorded on.
+    - save(file_path): Writes the trace to a binary file.
+    - load(file_path): Reads a trace from a binary file.
+
+Author: Peyman Kh
+Date: 19/Oct/2026
+"""
+# Import libraries
+import math
+import struct
+import sys
+from array import array
+from maze import Maze
+
+
+class SearchTrace:
+    """A compact record of the cells expanded by a search and the path it found."""
+
+    # File layout: magic, version, rows, cols, initial index, goal index, name length, expanded count, path count and
+    # suboptimality bound (NaN when the search reports none).
+    _HEADER = struct.Struct('<4sBIIIIIIId')
+    _MAGIC = b'MZTR'
+    _VERSION = 1
+
+    def __init__(self, rows, cols, algorithm, initial_state, goal_state, walls):
+        """
+        Initializes an empty trace.
+
+        Parameters:
+            - rows (int): The number of rows in the maze.
+            - cols (int): The number of columns in the maze.
+            - algorithm (str): The name of the search algorithm being traced.
+            - initial_state (tuple): The initial state of the search.
+            - goal_state (tuple): The goal state of the search.
+            - walls (array.array): The maze layout as produced by Maze.wall_masks().
+
+        Attributes:
+            - expanded (array.array): Index of each expanded cell, in expansion order.
+            - path (array.array): Index of each cell on the final path, empty if no path was found.
+            - bound (float): Proven suboptimality bound of the path for anytime searches such as ARA*, else None.
+
+        Returns:
+            - None
+        """
+        self.rows = rows
+        self.cols = cols
+        self.algorithm = algorithm
+        self.initial_state = initial_state
+        self.goal_state = goal_state
+        self.walls = walls
+        self.expanded = array('I')
+        self.path = array('I')
+        self.bound = None
+
+    @classmethod
+    def from_maze(cls, maze, algorithm, initial_state, goal_state):
+        """
+        Creates an empty trace for a search of the given maze.
+
+        Parameters:
+            - maze (Maze): The maze being searched.
+            - algorithm (str): The name of the search algorithm being traced.
+            - initial_state (tuple): The initial state of the search.
+            - goal_state (tuple): The goal state of the search.
+
+        Returns:
+            - SearchTrace: The new, empty trace.
+        """
+        return cls(maze.rows, maze.cols, algorithm, initial_state, goal_state, maze.wall_masks())
+
+    def __len__(self):
+        """
+        Returns the number of replay steps: one per expanded state.
+
+        Returns:
+            - int: The number of expanded states in the trace.
+        """
+        return len(self.expanded)
+
+    def _index(self, state):
+        """
+        Converts a state to its flat cell index.
+
+        Parameters:
+            - state (tuple): The state (cell) to convert.
+
+        Returns:
+            - int: The index of the cell.
+        """
+        return (state[0] - 1) * self.cols + state[1] - 1
+
+    def _state(self, index):
+        """
+        Converts a flat cell index back to its state.
+
+        Parameters:
+            - index (int): The index of the cell.
+
+        Returns:
+            - tuple: The state (cell) as (row, column).
+        """
+        return index // self.cols + 1, index % self.cols + 1
+
+    def record(self, state):
+        """
+        Appends an expanded state to the trace. Pass this method as the callback of an Agent search.
+
+        Parameters:
+            - state (tuple): The state expanded by the search.
+
+        Returns:
+            - None
+        """
+        self.expanded.append(self._index(state))
+
+    def set_path(self, path):
+        """
+        Stores the final path found by the search.
+
+        Parameters:
+            - path (list): The path as a list of states, or None if no path was found.
+
+        Returns:
+            - None
+        """
+        self.path = array('I', (self._index(state) for state in path or []))
+
+    def expanded_state(self, step):
+        """
+        Returns the state expanded at the given step.
+
+        Parameters:
+            - step (int): The zero-based replay step.
+
+        Returns:
+            - tuple: The state expanded at that step.
+        """
+        return self._state(self.expanded[step])
+
+    def path_states(self):
+        """
+        Returns the final path of the search.
+
+        Returns:
+            - list: The path as a list of states, or None if no path was found.
+        """
+        if not self.path:
+            return None
+        return [self._state(index) for index in self.path]
+
+    def to_maze(self):
+        """
+        Rebuilds the maze the trace was recorded on.
+
+        Returns:
+            - Maze: A maze with the recorded layout.
+        """
+        maze = Maze(self.rows, self.cols)
+        maze.load_wall_masks(self.walls)
+        return maze
+
+    @staticmethod
+    def _read_exact(file, size, file_path):
+        """
+        Reads exactly size bytes from a trace file.
+
+        Parameters:
+            - file (file object): The trace file, opened in binary mode.
+            - size (int): The number of bytes to read.
+            - file_path (str): The path of the file, for error messages.
+
+        Returns:
+            - bytes: The bytes read.
+        """
+        data = file.read(size)
+        if len(data) != size:
+            raise ValueError(f"{file_path} is truncated.")
+        return data
+
+    def save(self, file_path):
+        """
+        Writes the trace to a binary file. Integers are stored little-endian regardless of the platform.
+
+        Parameters:
+            - file_path (str): The path of the file to write.
+
+        Returns:
+            - None
+        """
+        name = self.algorithm.encode('utf-8')
+        expanded, path = array('I', self.expanded), array('I', self.path)
+        if sys.byteorder == 'big':
+            expanded.byteswap()
+            path.byteswap()
+
+        with open(file_path, 'wb') as file:
+            file.write(self._HEADER.pack(self._MAGIC, self._VERSION, self.rows, self.cols,
+                                         self._index(self.initial_state), self._index(self.goal_state),
+                                         len(name), len(expanded), len(path),
+                                         math.nan if self.bound is None else self.bound))
+            file.write(name)
+            file.write(self.walls.tobytes())
+            file.write(expanded.tobytes())
+            file.write(path.tobytes())
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Reads a trace from a binary file written by save(). Raises ValueError if the file is not a trace, is truncated
+        or holds cells outside its maze.
+
+        Parameters:
+            - file_path (str): The path of the file to read.
+
+        Returns:
+            - SearchTrace: The loaded trace.
+        """
+        with open(file_path, 'rb') as file:
+            header = file.read(cls._HEADER.size)
+            if len(header) != cls._HEADER.size:
+                raise ValueError(f"{file_path} is not a search trace file.")
+
+            magic, version, rows, cols, initial, goal, name_length, expanded_count, path_count, bound = \
+                cls._HEADER.unpack(header)
+            if magic != cls._MAGIC or version != cls._VERSION:
+                raise ValueError(f"{file_path} is not a supported search trace file.")
+
+            name = cls._read_exact(file, name_length, file_path).decode('utf-8')
+            walls = array('B')
+            walls.frombytes(cls._read_exact(file, rows * cols, file_path))
+            expanded = array('I')
+            expanded.frombytes(cls._read_exact(file, expanded_count * expanded.itemsize, file_path))
+            path = array('I')
+            path.frombytes(cls._read_exact(file, path_count * path.itemsize, file_path))
+
+            if file.read(1):
+                raise ValueError(f"{file_path} has unexpected data after the search trace.")
+
+        if sys.byteorder == 'big':
+            expanded.byteswap()
+            path.byteswap()
+
+        # Every cell index must lie inside the maze.
+        size = rows * cols
+        if initial >= size or goal >= size or max(expanded, default=0) >= size or max(path, default=0) >= size:
+            raise ValueError(f"{file_path} refers to cells outside its maze.")
+
+        trace = cls(rows, cols, name, (initial // cols + 1, initial % cols + 1), (goal // cols + 1, goal % cols + 1),
+                    walls)
+        trace.expanded = expanded
+        trace.path = path
+        trace.bound = None if math.isnan(bound) else bound
+        return trace
@@ -2,15 +2,18 @@
 This module provides a graphical user interface for visualizing and interacting with a maze.
 
 It leverages the tkinter library to create a window where users can generate mazes, choose a solving algorithm,
-and visually follow the algorithm's progress towards solving the maze.
+and visually follow the algorithm's progress towards solving the maze. Searches can also be recorded into compact trace
+files and replayed at any speed, seeking to any step, or compared side by side without running the search again.
 
 Author: Peyman Kh
 Date: 07/Feb/2024
 """
 # Import libraries
 import tkinter as tk
+from tkinter import filedialog
 from maze import Maze
 from agent import Agent
+from searchTrace import SearchTrace
 import time
 
 
@@ -38,6 +41,16 @@ class MazeUI:
             - solve_button (tk.Button): Button to solve the current maze.
             - algorithm (tk.StringVar): A tkinter variable holding the selected algorithm's name.
             - algorithm_menu (tk.OptionMenu): Dropdown menu for selecting the solving algorithm.
+            - traces (list): The search traces being replayed, shown side by side.
+            - trace_mazes (list): The maze each trace was recorded on.
+            - trace_step (int): The number of expansions currently shown for each trace.
+            - trace_playing (bool): Whether the traces are being played back.
+            - save_trace_button (tk.Button): Button to record a search of the current maze into a trace file.
+            - load_trace_button (tk.Button): Button to load a trace file for replay.
+            - compare_button (tk.Button): Button to load two trace files and replay them side by side.
+            - play_button (tk.Button): Button to start or pause the trace replay.
+            - speed_scale (tk.Scale): Slider for the number of expansions replayed per frame.
+            - step_scale (tk.Scale): Slider for seeking to any step of the replay.
         """
         self.agent = None
         self.root = tk.Tk()
@@ -57,6 +70,24 @@ class MazeUI:
         self.algorithm.set("DFS")  # default value
         self.algorithm_menu = tk.OptionMenu(self.root, self.algorithm, "DFS", "BFS", "A*")
         self.algorithm_menu.pack()
+        self.traces = []
+        self.trace_mazes = []
+        self.trace_step = 0
+        self.trace_playing = False
+        self.save_trace_button = tk.Button(self.root, text="Save Trace", command=self.save_trace)
+        self.save_trace_button.pack()
+        self.load_trace_button = tk.Button(self.root, text="Load Trace", command=self.load_trace)
+        self.load_trace_button.pack()
+        self.compare_button = tk.Button(self.root, text="Compare Traces", command=self.compare_traces)
+        self.compare_button.pack()
+        self.play_button = tk.Button(self.root, text="Play/Pause Trace", command=self.toggle_trace_playback)
+        self.play_button.pack()
+        self.speed_scale = tk.Scale(self.root, from_=1, to=5000, orient=tk.HORIZONTAL, length=300,
+                                    label="Replay speed (steps per frame)")
+        self.speed_scale.pack()
+        self.step_scale = tk.Scale(self.root, from_=0, to=0, orient=tk.HORIZONTAL, length=300, label="Trace step",
+                                   command=self.seek_trace)
+        self.step_scale.pack()
 
     def draw_maze(self):
         """
@@ -65,39 +96,59 @@ class MazeUI:
         Returns:
             - None
         """
+        # Leave trace replay and restore the canvas to the live maze.
+        self.trace_playing = False
+        self.traces = []
+        self.trace_mazes = []
+        self.canvas.config(width=self.cols * 20, height=self.rows * 20)
+
         self.canvas.delete("all")  # Clear the existing maze
-        for x in range(1, self.maze.rows + 1):
-            for y in range(1, self.maze.cols + 1):
+        self.draw_walls(self.maze)
+        # Drawing initial and goal states
+        self.draw_state(self.initial_state, "green")
+        self.draw_state(self.goal_state, "red")
+
+    def draw_walls(self, maze, offset=0):
+        """
+        Draws the cells and walls of a maze on the canvas.
+
+        Parameters:
+            - maze (Maze): The maze to draw.
+            - offset (int): Horizontal offset of the maze on the canvas, in pixels (Defaults to 0).
+
+        Returns:
+            - None
+        """
+        for x in range(1, maze.rows + 1):
+            for y in range(1, maze.cols + 1):
                 cell = (x, y)
-                x1, y1 = (x - 1) * 20, (y - 1) * 20
+                x1, y1 = (x - 1) * 20 + offset, (y - 1) * 20
                 # Draw cell background
                 self.canvas.create_rectangle(x1, y1, x1 + 20, y1 + 20, fill='white', outline="")
                 # Draw walls
-                if not self.maze.maze_map[cell]['R']:
+                if not maze.maze_map[cell]['R']:
                     self.canvas.create_line(x1 + 20, y1, x1 + 20, y1 + 20, fill='black', width=2)
-                if not self.maze.maze_map[cell]['L']:
+                if not maze.maze_map[cell]['L']:
                     self.canvas.create_line(x1, y1, x1, y1 + 20, fill='black', width=2)
-                if not self.maze.maze_map[cell]['U']:
+                if not maze.maze_map[cell]['U']:
                     self.canvas.create_line(x1, y1, x1 + 20, y1, fill='black', width=2)
-                if not self.maze.maze_map[cell]['D']:
+                if not maze.maze_map[cell]['D']:
                     self.canvas.create_line(x1, y1 + 20, x1 + 20, y1 + 20, fill='black', width=2)
-        # Drawing initial and goal states
-        self.draw_state(self.initial_state, "green")
-        self.draw_state(self.goal_state, "red")
 
-    def draw_state(self, state, color):
+    def draw_state(self, state, color, offset=0):
         """
         Draws a single state (cell) in the maze with a specified color.
 
         Parameters:
             - state (tuple): The state (cell) to draw, represented as (row, column).
             - color (str): The color to use for the state (cell).
+            - offset (int): Horizontal offset of the maze on the canvas, in pixels (Defaults to 0).
 
         Returns:
             - None
         """
         x, y = state
-        x1, y1 = (x - 1) * 20, (y - 1) * 20
+        x1, y1 = (x - 1) * 20 + offset, (y - 1) * 20
         self.canvas.create_rectangle(x1 + 2, y1 + 2, x1 + 18, y1 + 18, fill=color, outline="")
 
     def generate_and_draw_maze(self):
@@ -152,6 +203,147 @@ class MazeUI:
             self.root.update()
             time.sleep(0.05)
 
+    def save_trace(self):
+        """Solves the maze with the selected algorithm without drawing it and saves the search trace to a file."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".trace", filetypes=[("Search traces", "*.trace")])
+        if not file_path:
+            return
+
+        trace = Agent(self.maze).record_trace(self.algorithm.get(), self.initial_state, self.goal_state)
+        trace.save(file_path)
+
+    def load_trace(self):
+        """Loads a search trace from a file and shows it ready for replay."""
+        file_path = filedialog.askopenfilename(filetypes=[("Search traces", "*.trace")])
+        if file_path:
+            self.replay_traces([SearchTrace.load(file_path)])
+
+    def compare_traces(self):
+        """Loads two search traces from files and shows them side by side, replayed in step."""
+        file_paths = filedialog.askopenfilenames(title="Select two traces", filetypes=[("Search traces", "*.trace")])
+        if len(file_paths) >= 2:
+            self.replay_traces([SearchTrace.load(file_path) for file_path in file_paths[:2]])
+
+    def replay_traces(self, traces):
+        """
+        Shows one or more search traces side by side, positioned at their first step.
+
+        Parameters:
+            - traces (list): The SearchTrace instances to replay.
+
+        Returns:
+            - None
+        """
+        self.trace_playing = False
+        self.traces = traces
+        self.trace_mazes = [trace.to_maze() for trace in traces]
+
+        # Widen the canvas to fit every maze with a gap of one cell between them.
+        width = sum(trace.rows * 20 for trace in traces) + 20 * (len(traces) - 1)
+        height = max(trace.cols * 20 for trace in traces)
+        self.canvas.config(width=width, height=height)
+
+        self._reset_trace_replay()
+        self.step_scale.config(to=max(len(trace) for trace in traces))
+        self.step_scale.set(0)
+
+    def _trace_offsets(self):
+        """
+        Computes the horizontal canvas offset of each trace being replayed.
+
+        Returns:
+            - list: One offset in pixels per trace.
+        """
+        offsets = []
+        offset = 0
+        for trace in self.traces:
+            offsets.append(offset)
+            offset += trace.rows * 20 + 20
+        return offsets
+
+    def _reset_trace_replay(self):
+        """Redraws the mazes of the traces being replayed with no expansions shown."""
+        self.canvas.delete("all")
+        self.trace_step = 0
+        for trace, maze, offset in zip(self.traces, self.trace_mazes, self._trace_offsets()):
+            self.draw_walls(maze, offset)
+            self.draw_state(trace.initial_state, "green", offset)
+            self.draw_state(trace.goal_state, "red", offset)
+            if len(trace) == 0:
+                self._draw_trace_path(trace, offset)
+
+    def _draw_trace_path(self, trace, offset):
+        """
+        Draws the final path of a trace.
+
+        Parameters:
+            - trace (SearchTrace): The trace whose path to draw.
+            - offset (int): Horizontal offset of the trace's maze on the canvas, in pixels.
+
+        Returns:
+            - None
+        """
+        for state in trace.path_states() or []:
+            self.draw_state(state, "red", offset)
+
+    def seek_trace(self, step):
+        """
+        Shows the traces as they were after the given number of expansions, drawing each final path once its
+        search is complete. Only the difference from the current step is drawn when seeking forward.
+
+        Parameters:
+            - step (int | str): The step to show; strings come from the step slider.
+
+        Returns:
+            - None
+        """
+        step = int(step)
+        if not self.traces or step == self.trace_step:
+            return
+
+        # Seeking backwards starts over from an empty replay.
+        if step < self.trace_step:
+            self._reset_trace_replay()
+
+        for trace, offset in zip(self.traces, self._trace_offsets()):
+            for index in range(self.trace_step, min(step, len(trace))):
+                state = trace.expanded_state(index)
+                if state != trace.initial_state and state != trace.goal_state:
+                    self.draw_state(state, "#0884cc", offset)  # Light blue for the search process
+
+            if self.trace_step < len(trace) <= step:
+                self._draw_trace_path(trace, offset)
+
+        self.trace_step = step
+
+    def toggle_trace_playback(self):
+        """Starts or pauses the replay of the loaded traces, restarting it if it has finished."""
+        if not self.traces:
+            return
+
+        self.trace_playing = not self.trace_playing
+        if self.trace_playing:
+            if self.trace_step >= int(self.step_scale.cget("to")):
+                self.seek_trace(0)
+                self.step_scale.set(0)
+            self._advance_trace()
+
+    def _advance_trace(self):
+        """Replays the next frame of expansions and schedules the following one while playback is on."""
+        if not self.trace_playing:
+            return
+
+        last_step = int(self.step_scale.cget("to"))
+        step = min(self.trace_step + self.speed_scale.get(), last_step)
+        self.seek_trace(step)
+        self.step_scale.set(step)
+
+        if step >= last_step:
+            self.trace_playing = False
+            return
+
+        self.root.after(30, self._advance_trace)
+
     def run(self):
         """Starts the tkinter main event loop to run the application."""
         self.root.mainloop()